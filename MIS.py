@@ -4,16 +4,29 @@
 # Compatible with benchmark.py v2.5
 
 from __future__ import annotations
+from functools import lru_cache
 from typing import List, Dict
-import math
+
+import numpy as np
 
 # Exponential smoothing coefficient — 90 epochs ≈ long-term memory
 ALPHA = 1 / 90
 
+# Direction labels → integer codes (hashable keys for the _score cache)
+_DIR_MAP = {"UP": 1, "DOWN": -1, "FLAT": 0}
+
 
 # ---------------------------------------------------------------------
 # 🎯 Accuracy Scoring
 # ---------------------------------------------------------------------
+def _as_target(target):
+    """Duck-typed priceTarget cast: float, or None when absent/non-numeric."""
+    try:
+        return float(target)
+    except (TypeError, ValueError):
+        return None
+
+
 def accuracy_from_prediction(pred: Dict, truth_price_move: float) -> float:
     """
     Compute directional accuracy in [0,1] based on:
@@ -21,22 +34,31 @@ def accuracy_from_prediction(pred: Dict, truth_price_move: float) -> float:
       - Optional price target proximity
       - Confidence weighting
     """
-    dir_map = {"UP": 1, "DOWN": -1, "FLAT": 0}
-    pdir = dir_map.get(pred.get("direction"), 0)
-    sign = 1 if truth_price_move > 0 else (-1 if truth_price_move < 0 else 0)
+    return _score(
+        _DIR_MAP.get(pred.get("direction"), 0),
+        _as_target(pred.get("priceTarget")),
+        float(pred.get("confidence", 0.5)),
+        truth_price_move,
+    )
+
+
+@lru_cache(maxsize=8192)
+def _score(pdir: int, target: float | None, conf: float, truth_price_move: float) -> float:
+    """Memoized core of accuracy_from_prediction, keyed on the normalized inputs."""
+    sign = (truth_price_move > 0) - (truth_price_move < 0)
 
-    # Directional correctness baseline
-    base = 1.0 if pdir == sign else (0.6 if pdir == 0 and abs(truth_price_move) < 0.001 else 0.0)
+    # Directional correctness baseline (branchless: 1.0 match, 0.6 near-flat call, else 0)
+    match = int(pdir == sign)
+    flat = int((pdir == 0) & (abs(truth_price_move) < 0.001))
+    base = match + (1 - match) * 0.6 * flat
 
     # Optional price target proximity (rewarding tighter predictions)
-    target = pred.get("priceTarget")
-    if target is not None and isinstance(target, (int, float)):
+    if target is not None:
         # Within ±1% proximity = small bonus
-        proximity = max(0.0, 1.0 - min(1.0, abs(target - (1 + truth_price_move)) / 0.01))
+        proximity = min(max(1.0 - abs(target - (1 + truth_price_move)) / 0.01, 0.0), 1.0)
         base = min(1.0, base * (0.9 + 0.1 * proximity))
 
     # Confidence weighting (soft gate)
-    conf = float(pred.get("confidence", 0.5))
     conf = max(0.0, min(1.0, conf))
     return round(base * (0.5 + 0.5 * conf), 6)
 
@@ -54,6 +76,25 @@ def smooth_mis(prev_mis: float, accuracy: float, alpha: float = ALPHA) -> float:
     return round(max(0.0, min(1.0, mis)), 6)
 
 
+def smooth_mis_series(accuracies, prev_mis: float, alpha: float = ALPHA) -> np.ndarray:
+    """
+    Full MIS trajectory over a run of epochs in one pass:
+        s_t = (1-α)^t * s_0 + Σ_k (1-α)^(t-k) * α * a_k
+    Evaluated as a first-order IIR filter seeded with s_0 = prev_mis,
+    equivalent to calling smooth_mis once per epoch (minus rounding —
+    round once at export). Clamped in [0,1] with a branchless np.clip.
+    """
+    # scipy costs ~1s to import; only pay for it when a series is smoothed
+    from scipy.signal import lfilter
+
+    acc = np.asarray(accuracies, dtype=np.float64)
+    if acc.size == 0:
+        return acc
+    zi = [(1 - alpha) * prev_mis]
+    series, _ = lfilter([alpha], [1.0, -(1 - alpha)], acc, zi=zi)
+    return np.clip(series, 0.0, 1.0, out=series)
+
+
 # ---------------------------------------------------------------------
 # 🔄 Multi-Prediction Aggregation
 # ---------------------------------------------------------------------
@@ -61,6 +102,8 @@ def aggregate_agent_predictions(predictions: List[Dict], truth_price_move: float
     """
     Aggregate multiple predictions from a single agent.
     Returns a weighted average accuracy.
+    An agent has only a handful of predictions, so this stays on the
+    memoized scalar path.
     """
     if not predictions:
         return 0.0
@@ -68,25 +111,38 @@ def aggregate_agent_predictions(predictions: List[Dict], truth_price_move: float
     weights = [float(p.get("confidence", 1.0)) for p in predictions]
     total_weight = sum(weights)
     if total_weight <= 0:
-        return statistics.mean(accs)
+        return round(sum(accs) / len(accs), 6)
     return round(sum(a * w for a, w in zip(accs, weights)) / total_weight, 6)
 
 
 # ---------------------------------------------------------------------
 # 📊 Normalization
 # ---------------------------------------------------------------------
-def normalize_squared(mis_values: List[float]) -> List[float]:
+def normalize_squared_np(mis_values) -> np.ndarray:
     """
-    Super-linear normalization:
+    Super-linear normalization (vectorized):
         n_i = mis_i^2 / Σ(mis_j^2)
     This rewards high accuracy disproportionately,
     encouraging agents to improve beyond the mean.
+    Accepts any array-like and returns a float64 array; values are
+    left unrounded — round at export time.
     """
-    squares = [m * m for m in mis_values]
-    total = sum(squares)
+    a = np.asarray(mis_values, dtype=np.float64)
+    # Σ a² via dot (no temporary), then square + scale in place: one output buffer
+    total = float(np.dot(a, a))
     if total <= 0:
-        return [0.0 for _ in mis_values]
-    return [round(s / total, 6) for s in squares]
+        return np.zeros_like(a)
+    out = np.square(a)
+    out *= 1.0 / total
+    return out
+
+
+def normalize_squared(mis_values: List[float]) -> List[float]:
+    """
+    List-returning wrapper around normalize_squared_np for callers
+    that expect plain Python floats.
+    """
+    return normalize_squared_np(mis_values).tolist()
 
 
 # ---------------------------------------------------------------------
@@ -98,9 +154,24 @@ def collective_entropy(mis_values: List[float]) -> float:
       H = -Σ(p_i * log2(p_i))
     Measures diversity / disagreement among agents.
     """
-    norm = normalize_squared(mis_values)
-    eps = 1e-9
-    return round(-sum(p * math.log2(p + eps) for p in norm), 6)
+    norm = normalize_squared_np(mis_values)
+    # p*log2(p) with the p=0 term defined as 0 (no eps fudge needed)
+    plogp = np.multiply(norm, np.log2(norm, where=norm > 0, out=np.zeros_like(norm)))
+    return round(float(0.0 - plogp.sum()), 6)
+
+
+def collective_entropy_rows(mis_matrix) -> np.ndarray:
+    """
+    Row-wise collective_entropy for many collectives at once.
+    `mis_matrix` is 2-D (one row per collective, e.g. per epoch) and
+    NaN-padded where a row has fewer agents; all-NaN rows score 0.
+    """
+    m = np.asarray(mis_matrix, dtype=np.float64)
+    sq = np.square(np.nan_to_num(m, nan=0.0))
+    total = sq.sum(axis=1, keepdims=True)
+    norm = np.divide(sq, total, out=np.zeros_like(sq), where=total > 0)
+    plogp = np.multiply(norm, np.log2(norm, where=norm > 0, out=np.zeros_like(norm)))
+    return np.round(0.0 - plogp.sum(axis=1), 6)
 
 
 # ---------------------------------------------------------------------
@@ -3,11 +3,26 @@
 # Adds Collective Diversity Index (CDI) based on MIS entropy
 # Includes: learning curve, composite intelligence index, CSV export, metrics export
 
-import json, csv, statistics, math
+import json, math, os
 from typing import List, Dict
 from pathlib import Path
 from datetime import datetime
-from MIS import collective_entropy  # 🔥 new import for diversity
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from MIS import collective_entropy_rows  # 🔥 new import for diversity
+
+try:
+    import orjson  # fast Rust JSON parser; optional
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq  # columnar epoch cache; optional
+except ImportError:
+    pa = pq = None
 
 # ---------------------------- config --------------------------------
 OUT_DIR = Path("Epoch Report")
@@ -15,54 +30,215 @@ LEDGER_PATH = Path("ledger.csv")
 BENCHMARK_REPORT = OUT_DIR / "benchmark_report.json"
 TREND_CSV = OUT_DIR / "benchmark_trend.csv"
 METRICS_PATH = OUT_DIR / "metrics.json"
+# derived data, kept out of the committed report folder (gitignored)
+EPOCH_CACHE = Path(".athena_cache") / "epochs.parquet"
 
 # --------------------------- helpers --------------------------------
-def fnum(x) -> float:
-    """Safe float conversion to avoid crashes on malformed data."""
-    try:
-        return float(x)
-    except Exception:
-        return 0.0
+def _json_default(obj):
+    """Serialize NumPy scalars/arrays for the stdlib json fallback."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json(path: Path, obj) -> None:
+    """Write indented JSON (orjson when available; NumPy values allowed)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        return
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2, default=_json_default)
 
 
 def moving_average(data: List[float], window: int = 5) -> List[float]:
     """Return rolling 5-epoch moving average for smoother trend lines."""
     if len(data) < window:
         return data
-    smooth = []
-    for i in range(len(data)):
-        start = max(0, i - window + 1)
-        smooth.append(statistics.mean(data[start : i + 1]))
-    return smooth
+    # cumulative-sum window: O(n) instead of re-averaging every slice
+    c = np.cumsum(np.insert(np.asarray(data, dtype=np.float64), 0, 0.0))
+    warm = c[1:window] / np.arange(1, window)
+    tail = (c[window:] - c[:-window]) / window
+    return np.concatenate([warm, tail]).tolist()
 
 
 # --------------------------- loaders -------------------------------
-def load_epoch_reports() -> Dict[int, Dict]:
-    """Load and parse all epoch_X_report.json files."""
+def _read_report(file: Path) -> Dict:
+    """Parse a single report file (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(file.read_bytes())
+    with open(file, "r") as f:
+        return json.load(f)
+
+
+def epoch_record(epoch: int, r: Dict, size: int = 0, mtime_ns: int = 0) -> Dict:
+    """
+    Flatten one epoch report into the fields the benchmark reads.
+    Numeric fields are left raw here; coerce_records converts them.
+    """
+    claims = r.get("claims") if isinstance(r.get("claims"), list) else []
+    return {
+        "epoch": epoch,
+        "size": size,
+        "mtimeNs": mtime_ns,
+        "oracleTruth": r.get("oracleTruth"),
+        "aggregatePrediction": r.get("aggregatePrediction", r.get("oracleTruth")),
+        "collectiveMIS": r.get("collectiveMIS", 0),
+        "bonusTriggered": bool(r.get("bonusTriggered", False)),
+        "agentCount": len(r.get("claims", [])),
+        "pool": r.get("pool", 190000),
+        "oracleSources": list(r.get("oracleSources", [])),
+        "agentMis": [c.get("mis", 0) for c in claims],
+    }
+
+
+def _to_float(values) -> np.ndarray:
+    """Vectorized safe float conversion: malformed/missing values become 0."""
+    return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+
+
+def coerce_records(rows: List[Dict]) -> None:
+    """Coerce the raw numeric fields of `rows` in place, one column at a time."""
+    if not rows:
+        return
+    for key in ("oracleTruth", "aggregatePrediction", "collectiveMIS", "pool"):
+        for r, v in zip(rows, _to_float([r[key] for r in rows]).tolist()):
+            r[key] = v
+    # all claims' MIS in one pass, split back per epoch; keep only MIS > 0
+    lengths = [len(r["agentMis"]) for r in rows]
+    flat = _to_float([m for r in rows for m in r["agentMis"]])
+    for r, chunk in zip(rows, np.split(flat, np.cumsum(lengths)[:-1])):
+        r["agentMis"] = chunk[chunk > 0].tolist()
+
+
+def _epoch_files() -> Dict[int, Path]:
+    """Map epoch number → report file."""
+    files = {}
+    if not OUT_DIR.is_dir():
+        return files
+    # scandir + plain prefix/suffix checks: no glob regex or Path per entry
+    with os.scandir(OUT_DIR) as it:
+        for entry in it:
+            name = entry.name
+            if not (name.startswith("epoch_") and name.endswith("_report.json")):
+                continue
+            try:
+                files[int(name.split("_")[1])] = OUT_DIR / name
+            except ValueError as e:
+                print(f"[WARN] Failed to parse {OUT_DIR / name}: {e}")
+    return dict(sorted(files.items()))
+
+
+def load_epoch_reports(files: Dict[int, Path] | None = None) -> Dict[int, Dict]:
+    """Load and parse epoch_X_report.json files (all of them by default)."""
+    if files is None:
+        files = _epoch_files()
     reports = {}
-    for file in OUT_DIR.glob("epoch_*_report.json"):
-        try:
-            epoch = int(file.name.split("_")[1])
-            with open(file, "r") as f:
-                reports[epoch] = json.load(f)
-        except Exception as e:
-            print(f"[WARN] Failed to parse {file}: {e}")
+    # file reads release the GIL, so a thread pool overlaps I/O with parsing
+    with ThreadPoolExecutor() as pool:
+        futures = [(epoch, file, pool.submit(_read_report, file)) for epoch, file in files.items()]
+        for epoch, file, fut in futures:
+            try:
+                reports[epoch] = fut.result()
+            except Exception as e:
+                print(f"[WARN] Failed to parse {file}: {e}")
     return dict(sorted(reports.items()))
 
 
-def load_ledger() -> List[Dict]:
-    """Load the full reward ledger."""
+_CACHE_SCHEMA = (
+    pa.schema([
+        ("epoch", pa.int64()),
+        ("size", pa.int64()),
+        ("mtimeNs", pa.int64()),
+        ("oracleTruth", pa.float64()),
+        ("aggregatePrediction", pa.float64()),
+        ("collectiveMIS", pa.float64()),
+        ("bonusTriggered", pa.bool_()),
+        ("agentCount", pa.int64()),
+        ("pool", pa.float64()),
+        ("oracleSources", pa.list_(pa.string())),
+        ("agentMis", pa.list_(pa.float64())),
+    ])
+    if pa is not None else None
+)
+
+
+def load_epoch_records() -> Dict[int, Dict]:
+    """
+    Load per-epoch records, reusing the columnar cache in EPOCH_CACHE.
+    The JSON reports stay the source of truth: only reports that are new
+    (or whose size or mtime changed) are parsed, then the cache is rewritten.
+    """
+    files = _epoch_files()
+    records: Dict[int, Dict] = {}
+    if pq is not None and EPOCH_CACHE.exists():
+        try:
+            records = {rec["epoch"]: rec for rec in pq.read_table(EPOCH_CACHE).to_pylist()}
+        except Exception as e:
+            print(f"[WARN] Ignoring unreadable epoch cache {EPOCH_CACHE}: {e}")
+
+    # size alone misses same-size rewrites (fixed-length generatedAt stamps)
+    stamps = {epoch: (st.st_size, st.st_mtime_ns) for epoch, st in
+              ((epoch, file.stat()) for epoch, file in files.items())}
+    records = {e: rec for e, rec in records.items()
+               if stamps.get(e) == (rec["size"], rec.get("mtimeNs"))}
+    stale = {e: f for e, f in files.items() if e not in records}
+    if stale:
+        fresh = [epoch_record(epoch, r, *stamps[epoch]) for epoch, r in load_epoch_reports(stale).items()]
+        coerce_records(fresh)
+        records.update((rec["epoch"], rec) for rec in fresh)
+        if pq is not None:
+            EPOCH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            rows = [records[e] for e in sorted(records)]
+            pq.write_table(pa.Table.from_pylist(rows, schema=_CACHE_SCHEMA), EPOCH_CACHE)
+    return dict(sorted(records.items()))
+
+
+def total_ledger_rewards() -> float:
+    """Sum reward_ata over the full reward ledger (malformed cells count as 0)."""
     if not LEDGER_PATH.exists():
         print(f"[ERROR] Missing ledger: {LEDGER_PATH}")
-        return []
-    with open(LEDGER_PATH, "r", newline="") as f:
-        return list(csv.DictReader(f))
+        return 0.0
+    try:
+        # ragged/legacy rows are skipped, as the old DictReader loop tolerated them
+        rewards = pd.read_csv(LEDGER_PATH, usecols=["reward_ata"], on_bad_lines="skip")["reward_ata"]
+    except ValueError as e:  # no reward_ata column (or no header at all)
+        print(f"[WARN] Ledger {LEDGER_PATH} has no reward_ata column: {e}")
+        return 0.0
+    return float(pd.to_numeric(rewards, errors="coerce").fillna(0.0).sum())
 
 
 # --------------------------- core logic ---------------------------
-def compute_benchmark(reports: Dict[int, Dict]) -> Dict:
-    """Compute performance statistics across all epochs."""
-    epochs = sorted(reports.keys())
+def epoch_order(records: Dict[int, Dict]) -> List[int]:
+    """Epoch keys in order — load_epoch_records already returns them sorted."""
+    epochs = list(records)
+    assert all(a < b for a, b in zip(epochs, epochs[1:])), "epoch records must be sorted by epoch"
+    return epochs
+
+
+def epoch_columns(records: Dict[int, Dict], epochs: List[int]) -> Dict[str, np.ndarray]:
+    """Gather per-epoch numeric fields into parallel arrays (ordered by `epochs`)."""
+    rows = [records[e] for e in epochs]
+
+    # agent MIS as a NaN-padded [epoch, agent] matrix → all entropies in one pass
+    width = max((len(r["agentMis"]) for r in rows), default=0)
+    mis_matrix = np.full((len(rows), width), np.nan)
+    for i, r in enumerate(rows):
+        mis_matrix[i, :len(r["agentMis"])] = r["agentMis"]
+
+    return {
+        "truth": np.array([r["oracleTruth"] for r in rows], dtype=np.float64),
+        "aggregate": np.array([r["aggregatePrediction"] for r in rows], dtype=np.float64),
+        "cmis": np.array([r["collectiveMIS"] for r in rows], dtype=np.float64),
+        "bonus": np.array([r["bonusTriggered"] for r in rows], dtype=np.bool_),
+        "agent_count": np.array([r["agentCount"] for r in rows], dtype=np.int64),
+        "diversity": collective_entropy_rows(mis_matrix),
+        "has_agent_mis": np.array([bool(r["agentMis"]) for r in rows], dtype=np.bool_),
+    }
+
+
+def compute_benchmark(records: Dict[int, Dict], cols: Dict[str, np.ndarray] | None = None) -> Dict:
+    """Compute performance statistics across all epochs (`cols`: epoch_columns, if already built)."""
+    epochs = epoch_order(records)
     if len(epochs) < 2:
         print("Need at least 2 epochs for benchmarking.")
         return {}
@@ -81,42 +257,30 @@ def compute_benchmark(reports: Dict[int, Dict]) -> Dict:
         "diversity_trend": [],  # 🧩 NEW
     }
 
-    prev_truth = None
+    if cols is None:
+        cols = epoch_columns(records, epochs)
+    results["agent_count_trend"] = cols["agent_count"].tolist()
+    # diversity index only for epochs where agent MIS scores exist
+    results["diversity_trend"] = cols["diversity"][cols["has_agent_mis"]].tolist()
     for epoch in epochs:
-        r = reports[epoch]
-        truth = fnum(r.get("oracleTruth"))
-        aggregate = fnum(r.get("aggregatePrediction", truth))
-        cmis = fnum(r.get("collectiveMIS", 0))
-        bonus = bool(r.get("bonusTriggered", False))
-        agent_count = len(r.get("claims", []))
-        results["agent_count_trend"].append(agent_count)
-
-        # calculate diversity index if agent MIS scores exist
-        if "claims" in r and isinstance(r["claims"], list):
-            agent_mis = [fnum(c.get("mis", 0)) for c in r["claims"] if fnum(c.get("mis", 0)) > 0]
-            if agent_mis:
-                diversity = collective_entropy(agent_mis)
-                results["diversity_trend"].append(diversity)
-
-        if "oracleSources" in r:
-            results["oracle_sources_used"].update(r["oracleSources"])
-
-        if prev_truth is not None and truth > 0:
-            btc_err = abs(truth - prev_truth) / prev_truth
-            ath_err = abs(aggregate - truth) / truth
-            results["btc_hold_errors"].append(btc_err)
-            results["athena_errors"].append(ath_err)
-            results["collective_mis_trend"].append(cmis)
-            if ath_err < btc_err:
-                results["outperformance_count"] += 1
-            if bonus:
-                results["total_bonus_triggered"] += 1
-        prev_truth = truth
+        results["oracle_sources_used"].update(records[epoch]["oracleSources"])
+
+    # epoch-over-epoch errors in one vectorized pass (epoch i vs i-1)
+    truth, prev_truth = cols["truth"][1:], cols["truth"][:-1]
+    valid = truth > 0
+    btc_err = np.where(prev_truth > 0, np.abs(truth - prev_truth) / np.maximum(prev_truth, 1e-12), 0.0)[valid]
+    ath_err = (np.abs(cols["aggregate"][1:] - truth) / np.where(valid, truth, 1.0))[valid]
+    results["btc_hold_errors"] = btc_err.tolist()
+    results["athena_errors"] = ath_err.tolist()
+    mis_trend = cols["cmis"][1:][valid]
+    results["collective_mis_trend"] = mis_trend.tolist()
+    results["outperformance_count"] = int((ath_err < btc_err).sum())
+    results["total_bonus_triggered"] = int(cols["bonus"][1:][valid].sum())
 
     # --- averages and deltas ---
     if results["btc_hold_errors"]:
-        avg_btc_err = statistics.mean(results["btc_hold_errors"])
-        avg_ath_err = statistics.mean(results["athena_errors"])
+        avg_btc_err = float(btc_err.mean())
+        avg_ath_err = float(ath_err.mean())
         results["avg_btc_error"] = round(avg_btc_err, 6)
         results["avg_athena_error"] = round(avg_ath_err, 6)
         results["error_reduction_pct"] = round(
@@ -129,7 +293,7 @@ def compute_benchmark(reports: Dict[int, Dict]) -> Dict:
     # --- learning curve (smoothed MIS over time) ---
     results["collective_mis_trend_smooth"] = moving_average(results["collective_mis_trend"], 5)
     if results["collective_mis_trend"]:
-        results["avg_collective_mis"] = round(statistics.mean(results["collective_mis_trend"]), 6)
+        results["avg_collective_mis"] = round(float(mis_trend.mean()), 6)
         delta = (
             results["collective_mis_trend_smooth"][-1]
             - results["collective_mis_trend_smooth"][0]
@@ -138,7 +302,7 @@ def compute_benchmark(reports: Dict[int, Dict]) -> Dict:
 
     # --- diversity (entropy) ---
     if results["diversity_trend"]:
-        results["avg_diversity_index"] = round(statistics.mean(results["diversity_trend"]), 6)
+        results["avg_diversity_index"] = round(float(np.mean(results["diversity_trend"])), 6)
         results["diversity_stability"] = round(
             (1 - abs(results["diversity_trend"][-1] - results["diversity_trend"][0])
              / max(results["diversity_trend"])) * 100, 2
@@ -146,7 +310,7 @@ def compute_benchmark(reports: Dict[int, Dict]) -> Dict:
 
     # --- agent growth trend ---
     if results["agent_count_trend"]:
-        avg_agents = statistics.mean(results["agent_count_trend"])
+        avg_agents = float(cols["agent_count"].mean())
         results["avg_agent_count"] = round(avg_agents, 1)
         if results["agent_count_trend"][0] > 0:
             growth = (
@@ -155,9 +319,8 @@ def compute_benchmark(reports: Dict[int, Dict]) -> Dict:
             results["agent_growth_pct"] = round(growth, 2)
 
     # --- ROI simulation (total rewards distributed) ---
-    ledger = load_ledger()
-    total_rewards = sum(fnum(r.get("reward_ata")) for r in ledger)
-    first_pool = fnum(reports[epochs[0]].get("pool", 190000))
+    total_rewards = total_ledger_rewards()
+    first_pool = records[epochs[0]]["pool"]
     if first_pool > 0:
         roi = (total_rewards / first_pool - 1) * 100
         results["simulated_roi"] = {
@@ -178,42 +341,37 @@ def compute_benchmark(reports: Dict[int, Dict]) -> Dict:
 
 
 # --------------------------- CSV export ---------------------------
-def export_trend_csv(reports: Dict[int, Dict]):
-    """Create benchmark_trend.csv for charting and analytics."""
-    with open(TREND_CSV, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            "epoch", "oracle_truth", "aggregate_pred", "btc_error", "athena_error",
-            "outperformed", "collective_mis", "agent_count", "diversity_index", "bonus"
-        ])
-        prev_truth = None
-        for i, epoch in enumerate(sorted(reports.keys())):
-            r = reports[epoch]
-            truth = fnum(r.get("oracleTruth"))
-            aggregate = fnum(r.get("aggregatePrediction", truth))
-            cmis = fnum(r.get("collectiveMIS", 0))
-            agents = len(r.get("claims", []))
-            bonus = "YES" if r.get("bonusTriggered", False) else "NO"
-            diversity = 0
-            if "claims" in r and isinstance(r["claims"], list):
-                mis_values = [fnum(c.get("mis", 0)) for c in r["claims"] if fnum(c.get("mis", 0)) > 0]
-                if mis_values:
-                    diversity = collective_entropy(mis_values)
-
-            if i == 0:
-                btc_err = ath_err = 0
-                outperf = "N/A"
-            else:
-                btc_err = abs(truth - prev_truth) / prev_truth if prev_truth > 0 else 0
-                ath_err = abs(aggregate - truth) / truth if truth > 0 else 0
-                outperf = "YES" if ath_err < btc_err else "NO"
-
-            writer.writerow([
-                epoch, round(truth, 2), round(aggregate, 2),
-                round(btc_err, 6), round(ath_err, 6),
-                outperf, round(cmis, 6), agents, round(diversity, 6), bonus
-            ])
-            prev_truth = truth
+def export_trend_csv(records: Dict[int, Dict], cols: Dict[str, np.ndarray] | None = None):
+    """Create benchmark_trend.csv for charting and analytics (`cols`: epoch_columns, if already built)."""
+    epochs = epoch_order(records)
+    if cols is None:
+        cols = epoch_columns(records, epochs)
+    truth, aggregate = cols["truth"], cols["aggregate"]
+
+    # first epoch has no predecessor: errors 0, outperformance N/A
+    prev_truth = np.concatenate([truth[:1], truth[:-1]])
+    btc_err = np.where(prev_truth > 0, np.abs(truth - prev_truth) / np.where(prev_truth > 0, prev_truth, 1.0), 0.0)
+    ath_err = np.where(truth > 0, np.abs(aggregate - truth) / np.where(truth > 0, truth, 1.0), 0.0)
+    btc_err[0] = ath_err[0] = 0.0
+    outperf = np.where(ath_err < btc_err, "YES", "NO").astype(object)
+    outperf[0] = "N/A"
+    # keep the csv.writer format: integer 0 where no value was computed
+    btc_err, ath_err = btc_err.round(6).astype(object), ath_err.round(6).astype(object)
+    btc_err[0] = ath_err[0] = 0
+    diversity = np.where(cols["has_agent_mis"], cols["diversity"].astype(object), 0)
+
+    pd.DataFrame({
+        "epoch": epochs,
+        "oracle_truth": truth.round(2),
+        "aggregate_pred": aggregate.round(2),
+        "btc_error": btc_err,
+        "athena_error": ath_err,
+        "outperformed": outperf,
+        "collective_mis": cols["cmis"].round(6),
+        "agent_count": cols["agent_count"],
+        "diversity_index": diversity,
+        "bonus": np.where(cols["bonus"], "YES", "NO"),
+    }).to_csv(TREND_CSV, index=False, lineterminator="\r\n")
 
     print(f"📈 Exported benchmark_trend.csv → {TREND_CSV}")
 
@@ -243,8 +401,7 @@ def export_metrics(results):
         "totalRewardsDistributed": results.get("simulated_roi", {}).get("total_rewards_distributed"),
     }
 
-    with open(METRICS_PATH, "w") as f:
-        json.dump(metrics, f, indent=2)
+    write_json(METRICS_PATH, metrics)
     print(f"📊 Exported metrics.json → {METRICS_PATH}")
 
 
@@ -252,13 +409,15 @@ def export_metrics(results):
 def main():
     print("Athena Benchmark v2.6 — Intelligence & Diversity Index")
     print("=" * 70)
-    reports = load_epoch_reports()
-    if not reports:
+    records = load_epoch_records()
+    if not records:
         print(f"No epoch reports found in {OUT_DIR}/")
         return
 
-    print(f"Loaded {len(reports)} epoch reports.")
-    results = compute_benchmark(reports)
+    print(f"Loaded {len(records)} epoch reports.")
+    # per-epoch columns gathered once for the report and the trend CSV
+    cols = epoch_columns(records, epoch_order(records))
+    results = compute_benchmark(records, cols)
     if not results:
         return
 
@@ -273,11 +432,10 @@ def main():
     print(f"Avg Agents: {results.get('avg_agent_count', 0)} | Growth: {results.get('agent_growth_pct', 0):+.2f}%")
 
     BENCHMARK_REPORT.parent.mkdir(parents=True, exist_ok=True)
-    with open(BENCHMARK_REPORT, "w") as f:
-        json.dump(results, f, indent=2)
+    write_json(BENCHMARK_REPORT, results)
     print(f"Benchmark report → {BENCHMARK_REPORT}")
 
-    export_trend_csv(reports)
+    export_trend_csv(records, cols)
     export_metrics(results)
     print("\nAthena is evolving — diversity and truth are aligning 🌌")
 
@@ -18,11 +18,45 @@
 # - Agent history JSONL, oracle health metrics (SES/latency)
 # - Backwards-compatible inputs & robust I/O
 
-import json, csv, time, argparse, statistics, math
-from typing import Dict, List, Tuple
-from decimal import Decimal, ROUND_DOWN, InvalidOperation
+import json, os, time, argparse, statistics, math
+from typing import Dict, Iterable, Iterator, List, Tuple
+from decimal import Decimal, ROUND_DOWN
+from fractions import Fraction
+from functools import lru_cache
+from heapq import nlargest
+from itertools import islice
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from eth_utils import keccak
+try:
+    from sha3 import keccak_256 as _keccak_256  # pysha3: C-level constructor; optional
+except ImportError:
+    _keccak_256 = None
+try:
+    from Crypto.Hash import keccak as _keccak  # pycryptodome; optional fast path
+except ImportError:
+    _keccak = None
+import numpy as np
+try:
+    import orjson  # fast Rust JSON encoder/decoder; optional
+except ImportError:
+    orjson = None
+try:
+    import ijson  # incremental JSON parser for large agent files; optional
+except ImportError:
+    ijson = None
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional — NumPy/Python paths are used instead
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
 from pathlib import Path
 from dataclasses import dataclass
 
@@ -33,28 +67,119 @@ LEDGER_PATH = Path("ledger.csv")
 AGENT_HISTORY_PATH = Path("agent_history.jsonl")
 SPLIT_HISTORY_PATH = Path("split_history.jsonl")
 OUT_DIR = Path("out")  # fallback if --report not provided
+MERKLE_CACHE_DIR = Path(".athena_cache")  # Merkle levels of the last pulse run
 TOKEN_SYMBOL = "ATA"  # display only
+WEIGHT_SCALE = 10**18  # fixed-point scale for truth-power weights in wei math
 OUT_DIR.mkdir(exist_ok=True)
 
+# Pooled HTTP session reused across sources and epoch runs (keep-alive)
+SESSION = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+SESSION.mount("https://", _http_adapter)
+SESSION.mount("http://", _http_adapter)
+
 # --------------------------- utilities -------------------------------
+def json_dumps(data, indent: bool = False) -> bytes:
+    # UTF-8 JSON bytes; orjson when available, stdlib json otherwise (also when
+    # orjson refuses a value, e.g. an agent-supplied int beyond 64 bits)
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=(orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) if indent else 0)
+        except orjson.JSONEncodeError:
+            pass
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def json_loads(raw: bytes):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
 def load_json(path: str | Path, default):
     p = Path(path)
     if not p.exists():
         return default
-    with p.open(encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except Exception:
-            return default
+    try:
+        return json_loads(p.read_bytes())
+    except Exception:
+        return default
 
 def save_json(path: str | Path, data):
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    p.write_bytes(json_dumps(data, indent=True))
+
+def write_report(path: Path, report: Dict, proofs: Iterable[Tuple[int, List[str]]] | None = None) -> None:
+    # Indented report JSON; per-leaf proofs (the bulk of a large report) are
+    # streamed as a trailing "proofs" object one entry per line instead of
+    # being materialized as one dict of hex strings first
+    head = json_dumps(report, indent=True)
+    with path.open("wb") as f:
+        if proofs is None:
+            f.write(head)
+            return
+        f.write(head[:-2] + b',\n  "proofs": {')  # head ends with b"\n}"
+        sep = b"\n    "
+        for i, proof in proofs:
+            f.write(sep + b'"%d": ' % i + json_dumps(proof))
+            sep = b",\n    "
+        f.write(b"\n  }\n}")
+
+def csv_field(value) -> str:
+    # One field rendered as csv.writer (excel dialect) would: None -> "",
+    # quoted only when it holds a delimiter, quote or line break
+    if value is None:
+        return ""
+    text = str(value)
+    if not any(c in text for c in ',"\r\n'):
+        return text
+    return '"' + text.replace('"', '""') + '"'
+
+def append_bytes(path: str | Path, data: bytes) -> None:
+    # Whole batch in one O_APPEND write: no read-back, no userspace buffering,
+    # and the kernel positions it at EOF even with concurrent writers
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+@lru_cache(maxsize=4)
+def split_bp(split_key: str) -> Tuple[int, int, int, int, Tuple[Fraction, ...]]:
+    # split.json content (canonical JSON) -> merit/bounty/dev/treasury basis
+    # points and exact Top-3 base weights; parsed once per distinct split
+    d = json.loads(split_key)
+
+    def bp(pct) -> int:
+        return int(Decimal(str(pct)) * 100)
+
+    top3 = d.get("top3", [60, 25, 15])
+    tot = Fraction(sum(top3) or 100)
+    return (bp(d.get("merit", 60)), bp(d.get("bounty", 10)), bp(d.get("dev", 12)),
+            bp(d.get("treasury", 18)), tuple(Fraction(x) / tot for x in top3))
+
+def wei_to_float(amount_wei: int, decimals: int) -> float:
+    # int / int true division: exact quotient, correctly rounded to float
+    return amount_wei / 10 ** decimals
+
+def wei_to_q8(amount_wei: int, decimals: int) -> float:
+    # Token amount at 8 decimals, rounded half-even like Decimal.quantize
+    if decimals <= 8:
+        return amount_wei / 10 ** decimals
+    unit = 10 ** (decimals - 8)
+    q, r = divmod(amount_wei, unit)
+    if 2 * r > unit or (2 * r == unit and q & 1):
+        q += 1
+    return q / 100000000
+
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
 
 def validate_agent(wallet: str, data: dict):
-    if not isinstance(wallet, str) or not wallet.startswith("0x") or len(wallet) != 42:
+    # hex digits only: bytes.fromhex skips whitespace, so a padded wallet
+    # would decode short and shift every later address in the joined buffer
+    if (not isinstance(wallet, str) or not wallet.startswith("0x") or len(wallet) != 42
+            or not HEX_DIGITS.issuperset(wallet[2:])):
         raise ValueError(f"Agent wallet invalid: {wallet}")
     # allow either point prediction OR range+confidence
     if "range" in data:
@@ -74,6 +199,27 @@ def validate_agent(wallet: str, data: dict):
         if not (0 <= float(data["prediction"]) <= 1e12):
             raise ValueError(f"Agent {wallet}: prediction out of range")
 
+def iter_agents(path: str | Path) -> Iterator[Tuple[str, Dict]]:
+    # (wallet, submission) pairs from an agents file, validated as they are
+    # read. With ijson the file is parsed incrementally: the whole document is
+    # never held as text, and a bad record fails before the rest is parsed.
+    done = 0
+    if ijson is not None:
+        try:
+            with open(path, "rb") as f:
+                for wallet, data in ijson.kvitems(f, "", use_float=True):
+                    validate_agent(wallet, data)
+                    yield wallet, data
+                    done += 1
+            return
+        except ijson.JSONError:
+            # the C backend rejects ints beyond int64 ("integer overflow");
+            # finish with json_loads so such values parse as on the other path
+            pass
+    for wallet, data in islice(json_loads(Path(path).read_bytes()).items(), done, None):
+        validate_agent(wallet, data)
+        yield wallet, data
+
 def truth_power_weights(mis_values: List[float], rep_values: List[float], alpha: float) -> List[float]:
     # weight_i ∝ (MIS_i ** alpha) * rep_i
     raw = []
@@ -85,56 +231,223 @@ def truth_power_weights(mis_values: List[float], rep_values: List[float], alpha:
     return [x / s if s > 0 else 0.0 for x in raw]
 
 # ---- Merkle helpers -------------------------------------------------
-def merkle_leaf(wallet: str, amount_wei: int, epoch: int, pulse: int | None) -> bytes:
-    addr = bytes.fromhex(wallet[2:])
-    # Include pulse to avoid collisions across sub-epochs
-    pulse_bytes = (pulse if pulse is not None else 0).to_bytes(32, "big")
-    packed = addr + amount_wei.to_bytes(32, "big") + epoch.to_bytes(32, "big") + pulse_bytes
-    return keccak(packed)
-
-def keccak_pair(left: bytes, right: bytes) -> bytes:
-    return keccak(left + right)
-
-def build_merkle(leaves: List[bytes]) -> bytes:
-    if not leaves:
-        return b"\x00" * 32
-    level = leaves[:]
-    while len(level) > 1:
-        nxt = []
-        for i in range(0, len(level), 2):
-            a = level[i]
-            b = level[i + 1] if i + 1 < len(level) else level[i]
-            nxt.append(keccak_pair(a, b))
-        level = nxt
-    return level[0]
-
-def build_proofs(leaves: List[bytes]) -> Dict[str, List[str]]:
-    if not leaves:
-        return {}
-    levels = [leaves[:]]
-    while len(levels[-1]) > 1:
-        curr = levels[-1]
-        nxt = []
-        for i in range(0, len(curr), 2):
-            a = curr[i]
-            b = curr[i + 1] if i + 1 < len(curr) else curr[i]
-            nxt.append(keccak_pair(a, b))
-        levels.append(nxt)
-    proofs: Dict[int, List[bytes]] = {}
-    for idx in range(len(leaves)):
+# Tree convention (positional): parent = keccak(left || right) with the even
+# index on the left; a lone node at the end of an odd-length level is promoted
+# to the next level unchanged (no self-pair hash, no proof entry for that
+# level). This is not the sorted-pair layout RewardClaimV2.sol and the UI's
+# verifyProofLocally check: a verifier must take the sibling's side from the
+# leaf index bits, i.e. be fed positional proofs (index + path).
+if _keccak_256 is not None:
+    def keccak256(data: bytes) -> bytes:
+        return _keccak_256(data).digest()
+elif _keccak is not None:
+    def keccak256(data: bytes) -> bytes:
+        # raw pycryptodome constructor: skips eth_utils' input-type dispatch
+        return _keccak.new(digest_bits=256, data=data).digest()
+else:
+    keccak256 = keccak
+
+# Keccak-f[1600] round constants and rho rotation offsets (lane x + 5*y)
+_KECCAK_RC = np.array([
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+], dtype=np.uint64)
+_KECCAK_ROT = np.array([
+    0, 1, 62, 28, 27, 36, 44, 6, 55, 20, 3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8, 18, 2, 61, 56, 14,
+], dtype=np.uint64)
+KECCAK_RATE = 136  # bytes absorbed per keccak-256 permutation
+# Smallest batch handed to the compiled kernel. A cold compile (CI starts
+# with an empty numba cache) costs ~1.5s against ~5us saved per hash, so
+# production-size epochs stay on the library hash.
+KECCAK_JIT_MIN_BATCH = 16384
+
+@njit(cache=True)
+def _keccak_f1600(a):
+    # in-place permutation of the 25-lane state; all arithmetic stays uint64
+    c = np.empty(5, dtype=np.uint64)
+    b = np.empty(25, dtype=np.uint64)
+    one = np.uint64(1)
+    s64 = np.uint64(64)
+    for rnd in range(24):
+        for x in range(5):
+            c[x] = a[x] ^ a[x + 5] ^ a[x + 10] ^ a[x + 15] ^ a[x + 20]
+        for x in range(5):
+            c1 = c[(x + 1) % 5]
+            d = c[(x + 4) % 5] ^ ((c1 << one) | (c1 >> (s64 - one)))
+            for y in range(0, 25, 5):
+                a[x + y] ^= d
+        for x in range(5):
+            for y in range(5):
+                v = a[x + 5 * y]
+                r = _KECCAK_ROT[x + 5 * y]
+                b[y + 5 * ((2 * x + 3 * y) % 5)] = (v << r) | (v >> (s64 - r)) if r else v
+        for y in range(0, 25, 5):
+            for x in range(5):
+                a[x + y] = b[x + y] ^ (~b[(x + 1) % 5 + y] & b[(x + 2) % 5 + y])
+        a[0] ^= _KECCAK_RC[rnd]
+
+@njit(cache=True, parallel=True)
+def _keccak_blocks(buf, width):
+    # keccak256 of each consecutive width-byte message in buf. width < rate,
+    # so every message is one padded block and one permutation; messages are
+    # independent, one per lane.
+    n = buf.shape[0] // width
+    out = np.empty(n * 32, dtype=np.uint8)
+    for m in prange(n):
+        a = np.zeros(25, dtype=np.uint64)
+        base = m * width
+        for j in range(width):
+            a[j >> 3] ^= np.uint64(buf[base + j]) << np.uint64(8 * (j & 7))
+        a[width >> 3] ^= np.uint64(0x01) << np.uint64(8 * (width & 7))
+        a[16] ^= np.uint64(0x80) << np.uint64(56)
+        _keccak_f1600(a)
+        for j in range(32):
+            out[m * 32 + j] = np.uint8((a[j >> 3] >> np.uint64(8 * (j & 7))) & np.uint64(0xFF))
+    return out
+
+def hash_leaves(keys: List[bytes], epoch: int, pulse: int | None) -> List[bytes]:
+    # Leaf hashes for a batch of (addr || amount_wei) keys:
+    # leaf = keccak(addr || amount_wei || epoch || pulse), 32-byte big-endian
+    # ints; the pulse avoids collisions across sub-epochs. The epoch/pulse
+    # suffix shared by every leaf is encoded once, so each leaf costs one
+    # concatenation. Single entry point for a batched backend, like hash_layer.
+    tail = epoch.to_bytes(32, "big") + (pulse if pulse is not None else 0).to_bytes(32, "big")
+    if HAVE_NUMBA and len(keys) >= KECCAK_JIT_MIN_BATCH and len(keys[0]) + len(tail) < KECCAK_RATE:
+        n, k = len(keys), len(keys[0])
+        buf = np.empty((n, k + len(tail)), dtype=np.uint8)
+        buf[:, :k] = np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(n, k)
+        buf[:, k:] = np.frombuffer(tail, dtype=np.uint8)
+        digests = _keccak_blocks(buf.ravel(), k + len(tail)).tobytes()
+        return [digests[i:i + 32] for i in range(0, 32 * n, 32)]
+    return [keccak256(k + tail) for k in keys]
+
+# Levels are flat buffers: level d is the concatenation of its 32-byte nodes
+# (node i at [32*i, 32*i + 32)), leaves first, root last. No per-node objects.
+def node(level: bytes, i: int) -> bytes:
+    return bytes(level[32 * i:32 * i + 32])
+
+def hash_layer(level: bytes) -> bytes:
+    # Hash a whole tree layer into its parent layer in one call: adjacent
+    # (left||right) pairs are already contiguous 64-byte slices of the level,
+    # an odd tail is promoted as is. Single entry point for a batched backend.
+    size = len(level)
+    if HAVE_NUMBA and size >= 64 * KECCAK_JIT_MIN_BATCH:
+        parents = _keccak_blocks(np.frombuffer(level, dtype=np.uint8, count=size - size % 64), 64).tobytes()
+    else:
+        parents = b"".join([keccak256(level[i:i + 64]) for i in range(0, size - 63, 64)])
+    return parents + level[size - 32:] if size % 64 else parents
+
+def merkle_levels(leaves: List[bytes]) -> List[bytes]:
+    levels = [b"".join(leaves)]
+    while len(levels[-1]) > 32:
+        levels.append(hash_layer(levels[-1]))
+    return levels
+
+def iter_level_proofs(levels: List[bytes]) -> Iterator[Tuple[int, List[str]]]:
+    # (leaf index, hex path) pairs read off fully built levels. Each node is
+    # hex-encoded once (~2N strings); paths share those strings.
+    nodes = [["0x" + h[k:k + 64] for k in range(0, len(h), 64)] for h in (curr.hex() for curr in levels[:-1])]
+    for idx in range(len(levels[0]) // 32):
         path = []
         j = idx
-        for depth in range(len(levels) - 1):
-            curr = levels[depth]
-            is_right = (j % 2 == 1)
-            sib = curr[j - 1] if is_right else (curr[j + 1] if j + 1 < len(curr) else curr[j])
-            path.append(sib)
+        for level in nodes:
+            if j ^ 1 < len(level):  # promoted odd tail has no sibling
+                path.append(level[j ^ 1])
             j //= 2
-        proofs[idx] = path
-    out: Dict[str, List[str]] = {}
-    for i, path in proofs.items():
-        out[str(i)] = ["0x" + p.hex() for p in path]
-    return out
+        yield idx, path
+
+def build_multiproof(levels: List[bytes], indices: List[int] | None = None) -> Dict:
+    # Compact multiproof for a set of leaves (default: all of them) of the
+    # tree given by merkle_levels(): only the sibling hashes that cannot be
+    # derived from the proven leaves (levels[0]) are kept.
+    #
+    # Verifier: start with known = {index: leaf hash} and width = leafCount.
+    # Per level, walk known indices ascending; the sibling of i is i^1 -- take
+    # it from known if present, else consume the next entry of "hashes".
+    # Parent i//2 is keccak(left || right) with the even index on the left;
+    # if i^1 >= width (odd tail) node i is promoted to i//2 as is. Repeat with
+    # width = ceil(width / 2) until one node remains; it must equal the root.
+    n = len(levels[0]) // 32
+    if not n:
+        return {"leafCount": 0, "indices": [], "hashes": []}
+    idx = sorted(set(range(n) if indices is None else indices))
+    hashes: List[bytes] = []
+    known = idx
+    for level in levels[:-1]:
+        s = set(known)
+        width = len(level) // 32
+        for i in known:
+            sib = i ^ 1
+            if sib not in s and sib < width:
+                hashes.append(node(level, sib))
+        known = sorted({i // 2 for i in known})
+    return {
+        "leafCount": n,
+        "indices": idx,
+        "hashes": ["0x" + h.hex() for h in hashes],
+    }
+
+def level_cache_path(epoch: int, pulse: int) -> Path:
+    return MERKLE_CACHE_DIR / f"levels_{epoch}_{pulse}.bin"
+
+def load_level_cache(path: Path) -> Tuple[List[bytes], List[bytearray]] | None:
+    # layout: u32 leaf count | count x 52-byte (addr || amount) keys | every
+    # level's flat node buffer, leaves first
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+    n = int.from_bytes(raw[:4], "big")
+    keys = [raw[4 + 52 * i:56 + 52 * i] for i in range(n)]
+    pos = 4 + 52 * n
+    levels = []
+    width = n
+    while True:
+        levels.append(bytearray(raw[pos:pos + 32 * width]))
+        pos += 32 * width
+        if width <= 1:
+            break
+        width = (width + 1) // 2
+    if pos != len(raw):
+        return None
+    return keys, levels
+
+def save_level_cache(path: Path, keys: List[bytes], levels: List[bytes]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # trees of other epochs can never be reused; keep the cache bounded
+    for stale in path.parent.glob("levels_*.bin"):
+        if stale != path and not stale.name.startswith(path.name.rsplit("_", 1)[0] + "_"):
+            stale.unlink()
+    path.write_bytes(len(keys).to_bytes(4, "big") + b"".join(keys) + b"".join(levels))
+
+def cached_merkle_levels(path: Path, keys: List[bytes], epoch: int, pulse: int, save: bool = True) -> List[bytes]:
+    # Levels for leaves keyed by (addr || amount_wei). Against the cached tree
+    # of the same epoch/pulse only leaves whose key changed are rehashed, and
+    # only their paths to the root: O(k log N) instead of O(N) hashes.
+    # Leaves commit to the pulse id, so trees of different pulses share nothing.
+    cached = load_level_cache(path)
+    if cached is None or len(cached[0]) != len(keys):
+        levels = merkle_levels(hash_leaves(keys, epoch, pulse))
+    else:
+        old_keys, levels = cached
+        dirty = [i for i, (a, b) in enumerate(zip(old_keys, keys)) if a != b]
+        for i, leaf in zip(dirty, hash_leaves([keys[i] for i in dirty], epoch, pulse)):
+            levels[0][32 * i:32 * i + 32] = leaf
+        for curr, parent in zip(levels, levels[1:]):
+            dirty = sorted({i // 2 for i in dirty})
+            for p in dirty:
+                # children 2p, 2p+1 are one contiguous 64-byte slice; a
+                # promoted odd tail is a single 32-byte node
+                pair = curr[64 * p:64 * p + 64]
+                parent[32 * p:32 * p + 32] = keccak256(pair) if len(pair) == 64 else pair
+    if save:
+        save_level_cache(path, keys, levels)
+    return levels
 
 # --------------------------- oracle fetch ----------------------------
 @dataclass
@@ -145,9 +458,28 @@ class OracleHealth:
     latency_ms_p95: float
     ses: float  # pseudo "signal efficiency" based on variability
 
-def fetch_oracle_price(target_symbol="BTC-USD") -> Tuple[float, List[str], OracleHealth]:
-    with ORACLE_PATH.open(encoding="utf-8") as f:
-        oracle = json.load(f)
+def fetch_source(src: dict, timeout: float) -> Tuple[float | None, float]:
+    # Fetch + parse one oracle source -> (price or None on any failure, latency ms)
+    t0 = time.time()
+    try:
+        r = SESSION.get(src["url"], timeout=src.get("timeout", timeout))
+        r.raise_for_status()
+        p = parse_price(json_loads(r.content), src["name"])
+        p = float(p) if p is not None and math.isfinite(float(p)) else None
+    except Exception:
+        p = None
+    return p, (time.time() - t0) * 1000.0
+
+# target_symbol -> (monotonic fetch time, median, source names, health); only
+# consulted when the caller passes ttl > 0, e.g. repeated in-process dry runs
+_ORACLE_CACHE: Dict[str, Tuple[float, float, List[str], OracleHealth]] = {}
+
+def fetch_oracle_price(target_symbol="BTC-USD", ttl: float = 0.0) -> Tuple[float, List[str], OracleHealth]:
+    if ttl > 0 and target_symbol in _ORACLE_CACHE:
+        ts, med, src_names, health = _ORACLE_CACHE[target_symbol]
+        if time.monotonic() - ts < ttl:
+            return med, list(src_names), health
+    oracle = json_loads(ORACLE_PATH.read_bytes())
     target = next((t for t in oracle["targets"] if t["symbol"] == target_symbol), None)
     if not target:
         raise ValueError(f"No oracle target found for {target_symbol}")
@@ -157,25 +489,21 @@ def fetch_oracle_price(target_symbol="BTC-USD") -> Tuple[float, List[str], Oracl
     chainlink_threshold = fallback_conf.get("chainlinkThreshold", 3)
 
     prices, weights, src_names, latencies = [], [], [], []
-    total_sources = 0
-    for src in target["sources"]:
-        if not src.get("enabled", True):
-            continue
-        total_sources += 1
-        try:
-            t0 = time.time()
-            r = requests.get(src["url"], timeout=src.get("timeout", timeout))
-            r.raise_for_status()
-            data = r.json()
-            p = parse_price(data, src["name"])
-            if p is not None and math.isfinite(float(p)):
-                prices.append(float(p))
-                weights.append(float(src.get("weight", 0.9)))
-                src_names.append(src["name"])
-            latencies.append((time.time() - t0) * 1000.0)
-        except Exception:
-            latencies.append((time.time() - t0) * 1000.0)
-            # swallow; accounted via ok/failed counters
+    enabled = [src for src in target["sources"] if src.get("enabled", True)]
+    total_sources = len(enabled)
+
+    # Query all sources concurrently: wall time ≈ slowest source, not the sum.
+    # Results are consumed in config order so reports stay deterministic.
+    results = []
+    if enabled:
+        with ThreadPoolExecutor(max_workers=len(enabled)) as pool:
+            results = list(pool.map(lambda src: fetch_source(src, timeout), enabled))
+    for src, (p, latency_ms) in zip(enabled, results):
+        latencies.append(latency_ms)
+        if p is not None:  # failures are accounted via ok/failed counters
+            prices.append(p)
+            weights.append(float(src.get("weight", 0.9)))
+            src_names.append(src["name"])
 
     # Chainlink fallback if too few valid sources
     if len(prices) < chainlink_threshold:
@@ -183,9 +511,9 @@ def fetch_oracle_price(target_symbol="BTC-USD") -> Tuple[float, List[str], Oracl
         if cl:
             try:
                 t0 = time.time()
-                r = requests.get(cl["url"], timeout=cl.get("timeout", timeout))
+                r = SESSION.get(cl["url"], timeout=cl.get("timeout", timeout))
                 r.raise_for_status()
-                p = float(r.json().get("price"))
+                p = float(json_loads(r.content).get("price"))
                 prices.append(p)
                 weights.append(float(cl.get("weight", 0.99)))
                 src_names.append(cl["name"])
@@ -212,58 +540,65 @@ def fetch_oracle_price(target_symbol="BTC-USD") -> Tuple[float, List[str], Oracl
     except Exception:
         ses = 0.5
 
-    return med, src_names, OracleHealth(ok=ok, failed=failed, latency_ms_avg=lat_avg, latency_ms_p95=lat_p95, ses=ses)
+    health = OracleHealth(ok=ok, failed=failed, latency_ms_avg=lat_avg, latency_ms_p95=lat_p95, ses=ses)
+    _ORACLE_CACHE[target_symbol] = (time.monotonic(), med, list(src_names), health)
+    return med, src_names, health
+
+PRICE_PARSERS = {
+    "Coinbase":  lambda d: float(d["price"]),
+    "Kraken":    lambda d: float(next(iter(d["result"].values()))["c"][0]),
+    "Bitstamp":  lambda d: float(d["last"]),
+    "Binance":   lambda d: float(d["price"]) if "price" in d else float(d["data"]["price"]) if "data" in d else None,
+    "OKX":       lambda d: float(d["data"][0]["last"]),
+    "Bybit":     lambda d: float(d["result"]["list"][0]["lastPrice"]),
+    "Gemini":    lambda d: float(d["last"]),
+    "Bitfinex":  lambda d: float(d[6]),
+    "Huobi":     lambda d: float(d["tick"]["close"]),
+    "Gate":      lambda d: float(d[0]["last"]),
+    "Chainlink": lambda d: float(d.get("price")),
+}
 
 def parse_price(data, name):
+    parser = PRICE_PARSERS.get(name)
+    if parser is None:
+        return None
     try:
-        if name == "Coinbase":  return float(data["price"])
-        if name == "Kraken":    return float(list(data["result"].values())[0]["c"][0])
-        if name == "Bitstamp":  return float(data["last"])
-        if name == "Binance":   return float(data["price"]) if "price" in data else float(data["data"]["price"]) if "data" in data else None
-        if name == "OKX":       return float(data["data"][0]["last"])
-        if name == "Bybit":     return float(data["result"]["list"][0]["lastPrice"])
-        if name == "Gemini":    return float(data["last"])
-        if name == "Bitfinex":  return float(data[6])
-        if name == "Huobi":     return float(data["tick"]["close"])
-        if name == "Gate":      return float(data[0]["last"])
-        if name == "Chainlink": return float(data.get("price"))
+        return parser(data)
     except Exception:
         return None
-    return None
 
 # ----------------------------- scoring ------------------------------
-def compute_mis(agent: Dict, truth: float) -> float:
-    # Range + confidence scoring with width penalty, plus guards; else point MIS
-    if "range" in agent:
-        lo, hi = float(agent["range"][0]), float(agent["range"][1])
-        conf = float(agent.get("confidence", 0.8))
-        truth = float(truth)
-        if truth <= 0:
-            return 0.0
-        width = abs(hi - lo) / truth
-
-        # --- Guards to prevent edge-case gaming ---
-        # 1) Reject very wide ranges outright (>50% of truth)
-        if width > 0.5:
-            return 0.0
-        # 2) Damp overconfidence on extremely narrow intervals
-        if width < 0.05 and conf > 0.9:
-            conf = 0.9
-        # -----------------------------------------
-
-        penalty = 1.0 / (1.0 + width * 10.0)
-        hit = 1.0 if lo <= truth <= hi else 0.0
-        return max(0.0, min(1.0, hit * conf * penalty))
-
-    # point fallback
-    pred = float(agent["prediction"])
+def agent_arrays(agents: List[Dict]) -> Dict[str, np.ndarray]:
+    # SoA view of agent submissions for vectorized scoring
+    n = len(agents)
+    has_range = np.fromiter(("range" in a for a in agents), dtype=np.bool_, count=n)
+    lo = np.fromiter((float(a["range"][0]) if "range" in a else 0.0 for a in agents), dtype=np.float64, count=n)
+    hi = np.fromiter((float(a["range"][1]) if "range" in a else 0.0 for a in agents), dtype=np.float64, count=n)
+    conf = np.fromiter((float(a.get("confidence", 0.8)) if "range" in a else 0.0 for a in agents), dtype=np.float64, count=n)
+    pred = np.fromiter((0.0 if "range" in a else float(a["prediction"]) for a in agents), dtype=np.float64, count=n)
+    return {"has_range": has_range, "lo": lo, "hi": hi, "conf": conf, "pred": pred}
+
+def compute_mis_batch(cols: Dict[str, np.ndarray], truth: float) -> np.ndarray:
+    # MIS per agent over agent_arrays() columns, vectorized.
+    # Range + confidence: hit * conf * width penalty, with guards (ranges wider
+    # than 50% of truth score 0; confidence is capped at 0.9 under 5% width).
+    # Point predictions: 1 - relative error, floored at 0.
+    truth = float(truth)
     if truth <= 0:
-        return 0.0
-    err = abs(pred - truth) / truth
-    return max(0.0, 1.0 - err)
+        return np.zeros_like(cols["pred"])
+    lo, hi, conf = cols["lo"], cols["hi"], cols["conf"]
+    width = np.abs(hi - lo) / truth
+    conf = np.where((width < 0.05) & (conf > 0.9), 0.9, conf)
+    penalty = 1.0 / (1.0 + width * 10.0)
+    hit = ((lo <= truth) & (truth <= hi)).astype(np.float64)
+    mis_range = np.where(width > 0.5, 0.0, np.clip(hit * conf * penalty, 0.0, 1.0))
+    mis_point = np.maximum(0.0, 1.0 - np.abs(cols["pred"] - truth) / truth)
+    return np.where(cols["has_range"], mis_range, mis_point)
 
 # ----------------------------- main ---------------------------------
-def main():
+def main(argv: List[str] | None = None) -> Dict:
+    # argv: CLI arguments without the program name (default: sys.argv[1:]),
+    # so the epoch runner can call in-process; returns the report dict
     ap = argparse.ArgumentParser(description="Athena Genesis epoch orchestrator (v2.5.1)")
     ap.add_argument("--epoch", type=int, required=True)
     ap.add_argument("--pool", type=str, required=True)
@@ -271,49 +606,48 @@ def main():
     ap.add_argument("--report", type=str)
     ap.add_argument("--token_decimals", type=int, default=18)
     ap.add_argument("--emit-proofs", action="store_true")
+    ap.add_argument("--proof-format", choices=["paths", "multi"], default="paths",
+                    help="paths: per-leaf proofs (claim UI/contract); multi: one compact multiproof")
     ap.add_argument("--dry-run", action="store_true")
     ap.add_argument("--truth-power-alpha", type=float, default=2.0)
     ap.add_argument("--pulse", type=int, default=None, help="Optional sub-epoch identifier")
-    args = ap.parse_args()
+    ap.add_argument("--oracle-cache-ttl", type=float, default=0.0,
+                    help="Reuse an oracle price fetched in this process within N seconds (0 = always fetch)")
+    ap.add_argument("--generated-at", type=str, default=None,
+                    help="Timestamp stamped into the report as generatedAt (epoch runner)")
+    args = ap.parse_args(argv)
 
-    with open(args.agents, encoding="utf-8") as f:
-        agents: Dict[str, Dict] = json.load(f)
+    agents: Dict[str, Dict] = dict(iter_agents(args.agents))
 
     wallets = list(agents.keys())
+    subs = list(agents.values())  # submissions, indexed like wallets
     if not wallets:
         raise ValueError("No agents found")
 
-    for w in wallets:
-        validate_agent(w, agents[w])
-
     print(f"\n[Athena] Epoch {args.epoch} — {len(wallets)} agents")
-    truth_price, src_names, ohealth = fetch_oracle_price("BTC-USD")
+    truth_price, src_names, ohealth = fetch_oracle_price("BTC-USD", ttl=args.oracle_cache_ttl)
+
+    # Per-agent state is kept as parallel arrays indexed like `wallets`;
+    # submission fields are read once into columns, never looked up by wallet.
+    n = len(wallets)
+    agent_ids: List[str] = [a.get("agentId", "") for a in subs]
 
-    # Compute individual MIS
-    mis_values: List[float] = []
+    # Compute individual MIS (vectorized over all agents)
     timestamp = int(time.time())
-    for w in wallets:
-        m = compute_mis(agents[w], truth_price)
-        agents[w]["mis"] = m
-        mis_values.append(m)
+    mis = compute_mis_batch(agent_arrays(subs), truth_price)
+    mis_values: List[float] = mis.tolist()
 
     # -------- Insight tags + z-score feedback (NEW) --------
-    mean_mis = statistics.mean(mis_values)
-    stdev_mis = statistics.pstdev(mis_values) or 1.0
-    for w in wallets:
-        z = (agents[w]["mis"] - mean_mis) / stdev_mis
-        tag = "elite" if z > 1 else ("outlier" if z < -1 else "consistent")
-        agents[w]["zscore"] = round(z, 3)
-        agents[w]["tag"] = tag
+    stdev_mis = float(mis.std()) or 1.0
+    z = (mis - mis.mean()) / stdev_mis
+    zscores = [round(zi, 3) for zi in z.tolist()]
+    tags: List[str] = np.where(z > 1, "elite", np.where(z < -1, "outlier", "consistent")).tolist()
     # -------------------------------------------------------
 
     # Reputation memory
     rep = load_json("reputation.json", {})
     # Initialize unseen wallets with neutral rep 0.5
-    rep_values = []
-    for w in wallets:
-        prev = float(rep.get(w, 0.5))
-        rep_values.append(prev)
+    rep_values = [float(rep.get(w, 0.5)) for w in wallets]
 
     # Truth power weights (MIS^alpha) * rep
     weights = truth_power_weights(mis_values, rep_values, args.truth_power_alpha)
@@ -321,33 +655,37 @@ def main():
     # DAO split (percentages)
     split = load_json("split.json", {"merit":60, "bounty":10, "dev":12, "treasury":18, "top3": [60, 25, 15]})
 
+    # All reward math runs in integer wei; Decimal only parses the pool string
+    decimals = args.token_decimals
     pool = Decimal(str(args.pool))
-    merit_pool = pool * Decimal(str(split.get("merit", 60) / 100))
-    bounty_pool = pool * Decimal(str(split.get("bounty", 10) / 100))
-    dev_pool = pool * Decimal(str(split.get("dev", 12) / 100))
-    treasury_pool = pool * Decimal(str(split.get("treasury", 18) / 100))
+    pool_wei = int((pool * Decimal(10) ** decimals).to_integral_value(ROUND_DOWN))
 
-    # Merit rewards (proportional)
-    rewards_merit: Dict[str, Decimal] = {}
-    for i, w in enumerate(wallets):
-        rewards_merit[w] = Decimal(str(weights[i])) * merit_pool
+    merit_bp, bounty_bp, dev_bp, treasury_bp, top3_base = split_bp(json.dumps(split, sort_keys=True))
+    merit_pool_wei = pool_wei * merit_bp // 10000
+    bounty_pool_wei = pool_wei * bounty_bp // 10000
+    dev_pool_wei = pool_wei * dev_bp // 10000
+    treasury_pool_wei = pool_wei * treasury_bp // 10000
 
-    # Caps & floors
-    hard_cap = pool * Decimal("0.10")
-    med_reward = Decimal(sorted([float(x) for x in rewards_merit.values()])[len(rewards_merit) // 2]) if rewards_merit else Decimal("0")
-    soft_cap = med_reward * Decimal("3")
-    for w in rewards_merit:
-        rewards_merit[w] = min(rewards_merit[w], hard_cap, soft_cap)
+    # Merit rewards (proportional); weights fixed-point scaled by WEIGHT_SCALE.
+    # Wei amounts overflow int64, so these stay Python int lists.
+    merit_wei: List[int] = [int(wt * WEIGHT_SCALE) * merit_pool_wei // WEIGHT_SCALE for wt in weights]
 
-    floor = pool * Decimal("0.0001")
-    for w in rewards_merit:
-        if rewards_merit[w] < floor:
-            rewards_merit[w] = min(floor, hard_cap)
+    # Caps & floors
+    hard_cap = pool_wei // 10
+    # upper median: element n//2 of the sorted values, exact on wei ints
+    med_reward = statistics.median_high(merit_wei) if merit_wei else 0
+    soft_cap = med_reward * 3
+    floor = pool_wei // 10000
+    # caps then floor in one pass: a capped amount below the floor is raised
+    # to the floor (itself never above the hard cap)
+    cap = min(hard_cap, soft_cap)
+    floor_amt = min(floor, hard_cap)
+    merit_wei = [floor_amt if (c := min(x, cap)) < floor else c for x in merit_wei]
 
     # --- Top-3 bounty with equal streak-decay (Option A) ---
     # Rank by MIS; ties broken by higher reputation, then wallet asc
-    ranked = sorted(wallets, key=lambda w: (agents[w]["mis"], rep.get(w, 0.5), w), reverse=True)
-    top3 = ranked[:3]
+    top3_idx = nlargest(3, range(n), key=lambda i: (mis_values[i], rep_values[i], wallets[i]))
+    top3 = [wallets[i] for i in top3_idx]
 
     # Load / update per-position streak counters (wallet#pos)
     streak = load_json("streak.json", {})
@@ -363,81 +701,89 @@ def main():
     for i, w in enumerate(top3):
         streaks.append(bump_streak(w, i + 1))
 
-    # Reset streaks for wallets no longer in the current Top-3
+    # Reset streaks for wallets no longer in the current Top-3: their entries
+    # are dropped (a missing key reads as 0), so streak.json stays <= 3 keys
     keep_keys = {f"{w}#{i+1}" for i, w in enumerate(top3)}
-    for k in list(streak.keys()):
-        if k not in keep_keys:
-            streak[k] = 0
+    streak = {k: v for k, v in streak.items() if k in keep_keys}
 
-    # Decay curve: 1 / (1 + 0.1 * n)
-    def decay(n: int, k: Decimal = Decimal("0.1"), floor_d: Decimal = Decimal("0")) -> Decimal:
-        d = Decimal("1") / (Decimal("1") + k * Decimal(n))
+    # Decay curve: 1 / (1 + 0.1 * n), exact rational
+    def decay(n: int, k: Fraction = Fraction(1, 10), floor_d: Fraction = Fraction(0)) -> Fraction:
+        d = 1 / (1 + k * n)
         return max(d, floor_d)
 
-    top3_split = split.get("top3", [60, 25, 15])
-    tot = sum(top3_split) or 100
-    base = [Decimal(x) / Decimal(tot) for x in top3_split[:len(top3)]]
+    base = top3_base[:len(top3)]
 
     # Apply equal-form decay per position, then renormalize so Σ=1
     raw = [b * decay(streaks[i]) for i, b in enumerate(base)]
-    total_raw = sum(raw) or Decimal("1")
+    total_raw = sum(raw) or Fraction(1)
     bounty_weights = [r / total_raw for r in raw]
 
-    # Final bounty shares (full bounty pool conserved)
-    bounty_rewards: Dict[str, Decimal] = {w: Decimal("0") for w in wallets}
-    for i, w in enumerate(top3):
-        bounty_rewards[w] = bounty_pool * bounty_weights[i]
+    # Final bounty shares (wei, rounded down)
+    bounty_wei: List[int] = [0] * n
+    for pos, i in enumerate(top3_idx):
+        bounty_wei[i] = int(bounty_pool_wei * bounty_weights[pos])
 
     # Update reputation with current MIS (EMA)
-    for w in wallets:
-        prev = float(rep.get(w, 0.5))
-        rep[w] = round(0.9 * prev + 0.1 * float(agents[w]["mis"]), 6)
+    rep_values = [round(0.9 * r + 0.1 * m, 6) for r, m in zip(rep_values, mis_values)]
+    rep.update(zip(wallets, rep_values))
 
     # -------------------- Build Merkle + Claims ----------------------
-    scale = Decimal(f"1e{args.token_decimals}")
-
-    def to_wei(dec_amount: Decimal) -> int:
-        return int((dec_amount * scale).to_integral_value(ROUND_DOWN))
-
-    leaves: List[bytes] = []
+    emit_multi = args.emit_proofs and args.proof_format == "multi"
+    track_proofs = args.emit_proofs and not emit_multi
+    # Pulse runs go through the level cache (re-runs of an epoch/pulse only
+    # rehash changed paths); plain epochs build the levels directly
+    cache_path = level_cache_path(args.epoch, args.pulse) if args.pulse is not None else None
     claim_rows = []
 
     # combine merit + bounty
-    total_rewards = {w: (rewards_merit.get(w, Decimal("0")) + bounty_rewards.get(w, Decimal("0"))) for w in wallets}
+    total_wei = [m + b for m, b in zip(merit_wei, bounty_wei)]
+    weights_sum = sum(weights)
 
-    for w in wallets:
-        try:
-            reward_wei = to_wei(total_rewards[w])
-        except (InvalidOperation, OverflowError) as e:
-            raise ValueError(f"Bad reward for {w}: {total_rewards[w]} ({e})")
-        leaves.append(merkle_leaf(w, reward_wei, args.epoch, args.pulse))
+    # Display amounts (8 decimals), shared by claims, top-3 and ledger
+    merit_q8 = [wei_to_q8(x, decimals) for x in merit_wei]
+    bounty_q8 = [wei_to_q8(x, decimals) for x in bounty_wei]
+
+    for w, m, r, wt, z_i, tag, mw, bw, tw in zip(
+            wallets, mis_values, rep_values, weights, zscores, tags, merit_q8, bounty_q8, total_wei):
         claim_rows.append({
             "wallet": w,
-            "amount": float(total_rewards[w].quantize(Decimal("0.00000001"))),
-            "amountWei": str(reward_wei),
-            "mis": round(float(agents[w]["mis"]), 6),
-            "rep": float(rep.get(w, 0.5)),
-            "merit": float(rewards_merit[w].quantize(Decimal("0.00000001"))),
-            "bounty": float(bounty_rewards[w].quantize(Decimal("0.00000001"))),
-            "share": float(weights[wallets.index(w)]) if sum(weights) > 0 else 0.0,  # truth-power share (not bounty)
+            "amount": wei_to_q8(tw, decimals),
+            "amountWei": str(tw),
+            "mis": round(m, 6),
+            "rep": r,
+            "merit": mw,
+            "bounty": bw,
+            "share": float(wt) if weights_sum > 0 else 0.0,  # truth-power share (not bounty)
             # NEW feedback fields:
-            "zscore": agents[w]["zscore"],
-            "tag": agents[w]["tag"],
+            "zscore": z_i,
+            "tag": tag,
         })
 
+    # Leaf keys (addr || amount_wei): every address hex-decoded in one call
+    addrs = bytes.fromhex("".join(w[2:] for w in wallets))
+    if len(addrs) != 20 * n:
+        raise ValueError(f"Wallet addresses decoded to {len(addrs)} bytes, expected {20 * n}")
+    leaf_keys = [addrs[o:o + 20] + tw.to_bytes(32, "big") for o, tw in zip(range(0, 20 * n, 20), total_wei)]
+
     avg_mis = sum(mis_values) / len(mis_values) if mis_values else 0.0
-    root = build_merkle(leaves)
+    if cache_path is not None:
+        levels = cached_merkle_levels(cache_path, leaf_keys, args.epoch, args.pulse, save=not args.dry_run)
+    else:
+        levels = merkle_levels(hash_leaves(leaf_keys, args.epoch, args.pulse))
+    # one level build serves the root, per-leaf proofs and the multiproof
+    root = bytes(levels[-1])
+    proofs = iter_level_proofs(levels) if track_proofs else None
     root_hex = "0x" + root.hex()
 
     # -------------------- Build Report JSON -------------------------
     top3_section = [
         {
-            "wallet": w,
-            "mis": round(float(agents[w]["mis"]), 6),
-            "rep": float(rep.get(w, 0.5)),
-            "bounty": float(bounty_rewards[w].quantize(Decimal("0.00000001")))
+            "wallet": wallets[i],
+            "mis": round(mis_values[i], 6),
+            "rep": rep_values[i],
+            "bounty": bounty_q8[i]
         }
-        for w in top3
+        for i in top3_idx
     ]
 
     report = {
@@ -465,97 +811,80 @@ def main():
         }
     }
 
-    if args.emit_proofs:
-        proofs = build_proofs(leaves)
-        report["proofs"] = proofs
+    if args.generated_at:
+        report["generatedAt"] = args.generated_at
+    if emit_multi:
+        report["multiproof"] = build_multiproof(levels)
 
     report_path = Path(args.report) if args.report else OUT_DIR / f"epoch_{args.epoch}_report.json"
 
     # ---------------- Write Outputs -----------------
     if not args.dry_run:
         report_path.parent.mkdir(parents=True, exist_ok=True)
-        with report_path.open("w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2)
+        write_report(report_path, report, proofs)
 
-        # Ledger: merit and bounty categories as separate rows (for transparency)
+        # Ledger: merit and bounty categories as separate rows (for transparency).
+        # Lines are formatted directly (same bytes csv.writer produces) and
+        # written in one batch per file.
         exists = LEDGER_PATH.exists()
-        with LEDGER_PATH.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            if not exists:
-                writer.writerow(["date", "epoch", "pulse", "agent_id", "wallet", "mis", "rep", "reward_ata", "category", "tx_hash"])
-            for w in wallets:
-                # merit row
-                writer.writerow([
-                    time.strftime("%Y-%m-%d"),
-                    args.epoch,
-                    args.pulse,
-                    agents[w].get("agentId", ""),
-                    w,
-                    round(float(agents[w]["mis"]), 6),
-                    float(rep.get(w, 0.5)),
-                    float(rewards_merit[w].quantize(Decimal("0.00000001"))),
-                    "merit",
-                    ""
-                ])
-                # bounty row (may be zero)
-                if bounty_rewards[w] > 0:
-                    writer.writerow([
-                        time.strftime("%Y-%m-%d"),
-                        args.epoch,
-                        args.pulse,
-                        agents[w].get("agentId", ""),
-                        w,
-                        round(float(agents[w]["mis"]), 6),
-                        float(rep.get(w, 0.5)),
-                        float(bounty_rewards[w].quantize(Decimal("0.00000001"))),
-                        "bounty",
-                        ""
-                    ])
-            # dev + treasury synthetic rows (audit trail in CSV)
-            if dev_pool > 0:
-                writer.writerow([time.strftime("%Y-%m-%d"), args.epoch, args.pulse, "", "DEV", "", "", float(dev_pool), "dev", ""])
-            if treasury_pool > 0:
-                writer.writerow([time.strftime("%Y-%m-%d"), args.epoch, args.pulse, "", "TREASURY", "", "", float(treasury_pool), "treasury", ""])
+        head = f"{time.strftime('%Y-%m-%d')},{args.epoch},{csv_field(args.pulse)},"
+        rows = []
+        if not exists:
+            rows.append("date,epoch,pulse,agent_id,wallet,mis,rep,reward_ata,category,tx_hash\r\n")
+        for w, aid, m, r, mw, bw, b_wei in zip(wallets, agent_ids, mis_values, rep_values, merit_q8, bounty_q8, bounty_wei):
+            agent = f"{head}{csv_field(aid)},{w},{round(m, 6)},{r},"
+            # merit row
+            rows.append(f"{agent}{mw},merit,\r\n")
+            # bounty row (may be zero)
+            if b_wei > 0:
+                rows.append(f"{agent}{bw},bounty,\r\n")
+        # dev + treasury synthetic rows (audit trail in CSV)
+        if dev_pool_wei > 0:
+            rows.append(f"{head},DEV,,,{wei_to_float(dev_pool_wei, decimals)},dev,\r\n")
+        if treasury_pool_wei > 0:
+            rows.append(f"{head},TREASURY,,,{wei_to_float(treasury_pool_wei, decimals)},treasury,\r\n")
+        append_bytes(LEDGER_PATH, "".join(rows).encode("utf-8"))
 
         # Persist reputation & streak (position-based)
         save_json("reputation.json", rep)
         save_json("streak.json", streak)
 
         # Append agent history jsonl (include feedback fields)
-        with AGENT_HISTORY_PATH.open("a", encoding="utf-8") as f:
-            for w in wallets:
-                rec = {
-                    "ts": timestamp,
-                    "epoch": args.epoch,
-                    "pulse": args.pulse,
-                    "wallet": w,
-                    "agentId": agents[w].get("agentId", ""),
-                    "truth": float(truth_price),
-                    "prediction": float(agents[w].get("prediction", 0.0)),
-                    "range": agents[w].get("range"),
-                    "confidence": agents[w].get("confidence"),
-                    "mis": float(agents[w]["mis"]),
-                    "rep": float(rep.get(w, 0.5)),
-                    "zscore": agents[w]["zscore"],
-                    "tag": agents[w]["tag"],
-                    "reward_merit": float(rewards_merit[w]),
-                    "reward_bounty": float(bounty_rewards[w])
-                }
-                f.write(json.dumps(rec) + "\n")
-
-        # NEW: Split history JSONL audit trail
-        with SPLIT_HISTORY_PATH.open("a", encoding="utf-8") as f:
-            split_rec = {
+        lines = []
+        for w, a, aid, m, r, z_i, tag, mw, bw in zip(wallets, subs, agent_ids, mis_values, rep_values,
+                                                    zscores, tags, merit_wei, bounty_wei):
+            rec = {
                 "ts": timestamp,
                 "epoch": args.epoch,
                 "pulse": args.pulse,
-                "merit": float(merit_pool),
-                "bounty": float(bounty_pool),
-                "dev": float(dev_pool),
-                "treasury": float(treasury_pool),
-                "split": split
+                "wallet": w,
+                "agentId": aid,
+                "truth": float(truth_price),
+                "prediction": float(a.get("prediction", 0.0)),
+                "range": a.get("range"),
+                "confidence": a.get("confidence"),
+                "mis": m,
+                "rep": r,
+                "zscore": z_i,
+                "tag": tag,
+                "reward_merit": wei_to_float(mw, decimals),
+                "reward_bounty": wei_to_float(bw, decimals)
             }
-            f.write(json.dumps(split_rec) + "\n")
+            lines.append(json_dumps(rec))
+        append_bytes(AGENT_HISTORY_PATH, b"\n".join(lines) + b"\n")
+
+        # NEW: Split history JSONL audit trail
+        split_rec = {
+            "ts": timestamp,
+            "epoch": args.epoch,
+            "pulse": args.pulse,
+            "merit": wei_to_float(merit_pool_wei, decimals),
+            "bounty": wei_to_float(bounty_pool_wei, decimals),
+            "dev": wei_to_float(dev_pool_wei, decimals),
+            "treasury": wei_to_float(treasury_pool_wei, decimals),
+            "split": split
+        }
+        append_bytes(SPLIT_HISTORY_PATH, json_dumps(split_rec) + b"\n")
 
     # ---------------- Console Summary -----------------
     print(f"\n[Athena] Epoch {args.epoch} complete.")
@@ -575,5 +904,7 @@ def main():
     else:
         print("[dry-run] No files written.")
 
+    return report
+
 if __name__ == "__main__":
     main()
@@ -3,17 +3,18 @@
 🜂 Athena Genesis — Automated Epoch Runner (Final, Epoch Report edition)
 -------------------------------------------------
 This script wraps brain.py to generate epoch reports,
-append a UTC timestamp, and export the Merkle root
+stamp a UTC timestamp, and export the Merkle root
 to GitHub Actions for autonomous operation.
 -------------------------------------------------
 """
 
-import subprocess
 import os
-import json
 import sys
+import traceback
 from datetime import datetime
 
+import brain
+
 # -------------------------------------------------
 # Configuration
 # -------------------------------------------------
@@ -26,46 +27,37 @@ REPORT_PATH = f"{REPORT_DIR}/epoch_{EPOCH}_report.json"
 os.makedirs(REPORT_DIR, exist_ok=True)
 
 # -------------------------------------------------
-# Run brain.py
+# Run brain.py (in-process: no second interpreter start-up / re-import)
 # -------------------------------------------------
-cmd = [
-    "python", "brain.py",
+# Timestamp for self-proving reports: brain.py writes it into the report,
+# so the report is written exactly once
+start = datetime.utcnow()
+argv = [
     "--epoch", EPOCH,
     "--pool", POOL,
     "--emit-proofs",
-    "--report", REPORT_PATH
+    "--report", REPORT_PATH,
+    "--generated-at", start.isoformat() + "Z"
 ]
 
 print(f"🜂 Running Athena Epoch {EPOCH} (pool {POOL} ATA)...\n")
 
-start = datetime.utcnow()
-result = subprocess.run(cmd, capture_output=True, text=True)
-end = datetime.utcnow()
-
-print(result.stdout)
-
-if result.returncode != 0:
+try:
+    report = brain.main(argv)
+except Exception:
+    # in-process run: print the stack trace the subprocess stderr used to show
     print("❌ brain.py failed:\n")
-    print(result.stderr)
-    sys.exit(result.returncode)
+    traceback.print_exc()
+    sys.exit(1)
+end = datetime.utcnow()
 
 print(f"✅ brain.py completed successfully in {(end - start).seconds}s\n")
 
 # -------------------------------------------------
-# Parse report, append timestamp, and export root
+# Export root
 # -------------------------------------------------
 try:
-    with open(REPORT_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Add timestamp for self-proving reports
-    data["generatedAt"] = datetime.utcnow().isoformat() + "Z"
-
-    # Save updated report (overwrite)
-    with open(REPORT_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-    root = data.get("merkleRoot") or data.get("merkle_root")
+    root = report.get("merkleRoot") or report.get("merkle_root")
     if not root:
         raise KeyError("Missing merkleRoot field in report")
 
@@ -92,7 +84,7 @@ print(f"Epoch:        {EPOCH}")
 print(f"Pool:         {POOL} ATA")
 print(f"Merkle Root:  {root}")
 print(f"Report File:  {REPORT_PATH}")
-print(f"Generated At: {data['generatedAt']}")
+print(f"Generated At: {report['generatedAt']}")
 print("----------------------------------------------------\n")
 
 print("🎉 Epoch complete. Ready for IPFS pin or on-chain publish.\n")